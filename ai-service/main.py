@@ -8,6 +8,8 @@ load_dotenv()
 from routes.skill_extraction import router as skill_router
 from routes.roadmap import router as roadmap_router
 from routes.interview_coach import router as interview_router
+from utils.admission import gpt_admission
+from utils.answer_cache import answer_cache
 
 app = FastAPI(
     title="B2G AI Service",
@@ -36,6 +38,8 @@ async def health():
         "status": "OK",
         "service": "B2G AI Service",
         "openai_configured": bool(os.getenv("OPENAI_API_KEY")),
+        "admission": gpt_admission.stats(),
+        "answer_cache": answer_cache.stats(),
         "version": "1.0.0"
     }
 
@@ -1,9 +1,12 @@
 import os
 import json
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from utils.admission import gpt_admission, get_client_key, get_priority, estimate_tokens
+from utils.answer_cache import answer_cache
+
 router = APIRouter()
 
 # ─── Models ───────────────────────────────────────────────────────────────────
@@ -158,7 +161,7 @@ async def get_interview_questions(request: GetQuestionsRequest):
 
 # ─── POST /interview/evaluate ─────────────────────────────────────────────────
 @router.post("/interview/evaluate", response_model=EvaluationResponse)
-async def evaluate_interview_answer(request: EvaluateAnswerRequest):
+async def evaluate_interview_answer(request: EvaluateAnswerRequest, http_request: Request, http_response: Response):
     """Evaluate an interview answer using GPT or fallback logic."""
     if not request.answer.strip():
         raise HTTPException(status_code=400, detail="Answer cannot be empty")
@@ -166,6 +169,19 @@ async def evaluate_interview_answer(request: EvaluateAnswerRequest):
     api_key = os.getenv("OPENAI_API_KEY")
 
     if api_key:
+        # Reuse the evaluation of a near-identical answer to the same question
+        cached, similarity = answer_cache.get(request.question, request.role, request.preferred_language, request.answer)
+        if cached:
+            http_response.headers["X-Answer-Cache"] = "hit"
+            http_response.headers["X-Answer-Cache-Similarity"] = f"{similarity:.3f}"
+            return EvaluationResponse(**cached)
+        http_response.headers["X-Answer-Cache"] = "miss"
+
+        await gpt_admission.acquire(
+            get_client_key(http_request),
+            get_priority(http_request),
+            estimate_tokens(request.question + request.answer, 800)
+        )
         try:
             from openai import AsyncOpenAI
             client = AsyncOpenAI(api_key=api_key)
@@ -201,7 +217,9 @@ Only return JSON."""
             import re
             content = re.sub(r'```json\n?|\n?```', '', content).strip()
             result = json.loads(content)
-            return EvaluationResponse(**result)
+            evaluation = EvaluationResponse(**result)
+            answer_cache.put(request.question, request.role, request.preferred_language, request.answer, evaluation.model_dump())
+            return evaluation
 
         except Exception as e:
             print(f"GPT evaluation failed: {e}")
@@ -1,9 +1,13 @@
 import os
 import json
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from utils.roadmap_scheduler import schedule_skills, is_known_skill
+from utils.resource_catalog import get_catalog
+from utils.admission import gpt_admission, get_client_key, get_priority, estimate_tokens
+
 router = APIRouter()
 
 # ─── Models ───────────────────────────────────────────────────────────────────
@@ -35,89 +39,31 @@ LANGUAGE_NAMES = {
     "pa": "Punjabi", "ml": "Malayalam"
 }
 
-# ─── Free Resource Templates ──────────────────────────────────────────────────
-FREE_RESOURCES = {
-    "Python": [
-        {"title": "Python.org Official Docs", "url": "https://docs.python.org/3/tutorial/", "type": "docs"},
-        {"title": "freeCodeCamp Python", "url": "https://www.freecodecamp.org/learn/scientific-computing-with-python/", "type": "course"},
-        {"title": "CS50P – Python", "url": "https://cs50.harvard.edu/python/", "type": "course"}
-    ],
-    "JavaScript": [
-        {"title": "MDN Web Docs", "url": "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide", "type": "docs"},
-        {"title": "The Odin Project", "url": "https://www.theodinproject.com/", "type": "course"},
-        {"title": "JavaScript.info", "url": "https://javascript.info/", "type": "tutorial"}
-    ],
-    "SQL": [
-        {"title": "SQLZoo", "url": "https://sqlzoo.net/", "type": "interactive"},
-        {"title": "Mode SQL Tutorial", "url": "https://mode.com/sql-tutorial/", "type": "tutorial"},
-        {"title": "W3Schools SQL", "url": "https://www.w3schools.com/sql/", "type": "tutorial"}
-    ],
-    "Git": [
-        {"title": "Git Official Docs", "url": "https://git-scm.com/doc", "type": "docs"},
-        {"title": "Learn Git Branching", "url": "https://learngitbranching.js.org/", "type": "interactive"},
-        {"title": "GitHub Skills", "url": "https://skills.github.com/", "type": "course"}
-    ],
-    "DSA": [
-        {"title": "GeeksForGeeks DSA", "url": "https://www.geeksforgeeks.org/data-structures/", "type": "tutorial"},
-        {"title": "LeetCode", "url": "https://leetcode.com/", "type": "practice"},
-        {"title": "Visualgo", "url": "https://visualgo.net/", "type": "interactive"}
-    ],
-    "Machine Learning": [
-        {"title": "Google ML Crash Course", "url": "https://developers.google.com/machine-learning/crash-course", "type": "course"},
-        {"title": "fast.ai", "url": "https://www.fast.ai/", "type": "course"},
-        {"title": "Kaggle Learn", "url": "https://www.kaggle.com/learn", "type": "course"}
-    ],
-    "default": [
-        {"title": "freeCodeCamp", "url": "https://www.freecodecamp.org/", "type": "course"},
-        {"title": "Khan Academy", "url": "https://www.khanacademy.org/computing", "type": "course"},
-        {"title": "YouTube", "url": "https://www.youtube.com/", "type": "video"}
-    ]
-}
-
-def get_resources_for_skill(skill: str) -> List[dict]:
-    """Get free learning resources for a skill."""
-    for key in FREE_RESOURCES:
-        if key.lower() in skill.lower() or skill.lower() in key.lower():
-            return FREE_RESOURCES[key]
-    return FREE_RESOURCES["default"]
-
-
 def generate_roadmap_fallback(
     target_role: str,
     missing_skills: List[str],
-    availability_hours: int
+    availability_hours: int,
+    preferred_language: str = "en"
 ) -> dict:
     """
     Generate a structured roadmap without GPT (fallback mode).
-    Groups skills into weeks based on availability.
+    Orders skills by prerequisites and packs them into weeks by availability,
+    splitting skills that take longer than the hours left in a week.
     """
-    hours_per_skill = 20  # Estimated hours to learn each skill
-    skills_per_week = max(1, availability_hours // hours_per_skill)
-    weekly_plan = []
-
-    for i, skill in enumerate(missing_skills):
-        week_num = (i // skills_per_week) + 1
-        resources = get_resources_for_skill(skill)
-
-        weekly_plan.append({
-            "week": week_num,
-            "focus_skill": skill,
-            "topics": [
-                f"Introduction to {skill}",
-                f"Core concepts of {skill}",
-                f"Hands-on practice with {skill}",
-                f"Build a mini project using {skill}"
-            ],
-            "resources": resources[:2],
-            "milestone": f"Complete 2 practice exercises in {skill}",
-            "estimated_hours": min(availability_hours, hours_per_skill)
-        })
+    weekly_plan = schedule_skills(missing_skills, availability_hours)
+    resources = get_catalog().get_batch(
+        list({entry["focus_skill"]: None for entry in weekly_plan}),
+        preferred_language,
+        limit=2
+    )
+    for entry in weekly_plan:
+        entry["resources"] = resources[entry["focus_skill"]]
 
     return {
         "target_role": target_role,
         "total_weeks": weekly_plan[-1]["week"] if weekly_plan else 0,
         "weekly_plan": weekly_plan,
-        "summary": f"Your personalized roadmap to become a {target_role}. Focus on {len(missing_skills)} skills over {weekly_plan[-1]['week'] if weekly_plan else 0} weeks.",
+        "summary": f"Your personalized roadmap to become a {target_role}. Focus on {len(set(e['focus_skill'] for e in weekly_plan))} skills over {weekly_plan[-1]['week'] if weekly_plan else 0} weeks.",
         "tips": [
             "Practice daily, even 30 minutes helps",
             "Build projects to reinforce learning",
@@ -191,25 +137,42 @@ Only return the JSON, no markdown."""
 
 # ─── POST /generate ──────────────────────────────────────────────────────────
 @router.post("/generate", response_model=RoadmapResponse)
-async def generate_roadmap(request: RoadmapRequest):
+async def generate_roadmap(request: RoadmapRequest, http_request: Request):
     """Generate AI-powered week-by-week learning roadmap."""
     if not request.missing_skills:
         raise HTTPException(status_code=400, detail="No missing skills provided")
 
-    # Try GPT first
-    roadmap = await generate_roadmap_with_gpt(
-        request.target_role,
-        request.missing_skills,
-        request.availability_hours,
-        request.preferred_language
-    )
+    # The local planner covers English roadmaps made only of skills it knows
+    roadmap = {}
+    if request.preferred_language == "en" and all(is_known_skill(s) for s in request.missing_skills):
+        roadmap = generate_roadmap_fallback(
+            request.target_role,
+            request.missing_skills,
+            request.availability_hours,
+            request.preferred_language
+        )
+
+    # Otherwise try GPT first
+    if not roadmap and os.getenv("OPENAI_API_KEY"):
+        await gpt_admission.acquire(
+            get_client_key(http_request),
+            get_priority(http_request),
+            estimate_tokens(", ".join(request.missing_skills), 2500)
+        )
+        roadmap = await generate_roadmap_with_gpt(
+            request.target_role,
+            request.missing_skills,
+            request.availability_hours,
+            request.preferred_language
+        )
 
     # Fallback to rule-based generation
     if not roadmap or not roadmap.get("weekly_plan"):
         roadmap = generate_roadmap_fallback(
             request.target_role,
             request.missing_skills,
-            request.availability_hours
+            request.availability_hours,
+            request.preferred_language
         )
 
     return RoadmapResponse(**roadmap)
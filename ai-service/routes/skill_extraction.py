@@ -2,10 +2,11 @@ import io
 import re
 import os
 from typing import List, Dict
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from pydantic import BaseModel
 
 from utils.skill_keywords import SKILL_CATEGORIES, categorize_skill
+from utils.admission import gpt_admission, get_client_key, get_priority, estimate_tokens
 
 router = APIRouter()
 
@@ -84,12 +85,19 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
         raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {str(e)}")
 
 
-async def try_openai_extraction(text: str, language: str = "en") -> List[Dict]:
+async def try_openai_extraction(text: str, language: str = "en", http_request: Request = None) -> List[Dict]:
     """Use OpenAI GPT to extract skills if API key is available."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return []
 
+    if http_request is not None:
+        await gpt_admission.acquire(
+            get_client_key(http_request),
+            get_priority(http_request),
+            estimate_tokens(text[:3000], 1000)
+        )
+
     try:
         from openai import AsyncOpenAI
         client = AsyncOpenAI(api_key=api_key)
@@ -121,7 +129,7 @@ Text:
 
 # ─── POST /extract-resume (PDF Upload) ───────────────────────────────────────
 @router.post("/extract-resume", response_model=SkillExtractionResponse)
-async def extract_skills_from_resume(resume: UploadFile = File(...)):
+async def extract_skills_from_resume(http_request: Request, resume: UploadFile = File(...)):
     """Extract skills from uploaded PDF resume."""
     if not resume.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
@@ -137,7 +145,7 @@ async def extract_skills_from_resume(resume: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
 
     # Try OpenAI first, fall back to keyword matching
-    skills = await try_openai_extraction(text)
+    skills = await try_openai_extraction(text, http_request=http_request)
     method = "openai"
 
     if not skills:
@@ -153,7 +161,7 @@ async def extract_skills_from_resume(resume: UploadFile = File(...)):
 
 # ─── POST /extract-skills-text (Manual Text) ─────────────────────────────────
 @router.post("/extract-skills-text", response_model=SkillExtractionResponse)
-async def extract_skills_from_text_input(request: ManualSkillRequest):
+async def extract_skills_from_text_input(request: ManualSkillRequest, http_request: Request):
     """Extract skills from manually entered text (supports regional languages via translation)."""
     text = request.text
 
@@ -166,7 +174,7 @@ async def extract_skills_from_text_input(request: ManualSkillRequest):
             pass  # Use original text if translation fails
 
     # Try OpenAI first
-    skills = await try_openai_extraction(text, request.language)
+    skills = await try_openai_extraction(text, request.language, http_request)
     method = "openai"
 
     if not skills:
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from utils.admission import AdmissionController, PRIORITY_CLASSES, INTERACTIVE, BULK
+
+
+def make_controller() -> AdmissionController:
+    # 600 tokens/minute = 10 tokens/second, with the bucket drained up front
+    controller = AdmissionController(tokens_per_minute=600, client_rpm={INTERACTIVE: 100, BULK: 100})
+    controller.upstream.take(controller.upstream.capacity)
+    return controller
+
+
+def queued_waiters(controller: AdmissionController) -> list:
+    return [entry[2] for queue in controller._queues.values() for entry in queue if entry[2].active]
+
+
+class AdmissionControllerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cancelled_future_does_not_break_other_callers(self):
+        controller = make_controller()
+        first = asyncio.create_task(controller.acquire("a", INTERACTIVE, cost=5))
+        await asyncio.sleep(0)
+        (waiter,) = queued_waiters(controller)
+
+        # The future is cancelled a tick before the caller gets to abandon it,
+        # and budget frees up so the next pump would dispatch the head waiter
+        waiter.future.cancel()
+        controller.upstream.tokens = controller.upstream.capacity
+        await controller.acquire("c", INTERACTIVE, cost=5)
+
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(controller.stats()["queue_depth"], 0)
+        self.assertEqual(controller.stats()["classes"][INTERACTIVE]["admitted"], 1)
+        self.assertGreaterEqual(controller.upstream.available(), controller.upstream.capacity - 5)
+
+    async def test_cancelled_task_leaves_queue(self):
+        controller = make_controller()
+        task = asyncio.create_task(controller.acquire("a", INTERACTIVE, cost=5))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(controller.stats()["queue_depth"], 0)
+        self.assertNotIn((INTERACTIVE, "a"), controller._last_finish)
+
+    async def test_timeout_returns_429_and_leaves_queue(self):
+        controller = make_controller()
+        with patch.dict(PRIORITY_CLASSES[INTERACTIVE], {"max_wait": 0.2}):
+            task = asyncio.create_task(controller.acquire("a", INTERACTIVE, cost=1))
+            await asyncio.sleep(0)
+            # Starve the queue without giving the pump a chance to re-check it
+            controller.upstream.take(100)
+            controller._timer.cancel()
+
+            with self.assertRaises(HTTPException) as ctx:
+                await task
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(controller.stats()["queue_depth"], 0)
+
+    async def test_hopeless_request_is_shed_immediately(self):
+        controller = make_controller()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        # 10 tokens/second cannot serve 500 tokens within the 10s max_wait
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire("a", INTERACTIVE, cost=500)
+
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertLess(loop.time() - started, 1.0)
+        self.assertIn("Retry-After", ctx.exception.headers)
+        self.assertEqual(controller.stats()["queue_depth"], 0)
+        self.assertNotIn((INTERACTIVE, "a"), controller._last_finish)
+
+    async def test_client_over_rate_is_rejected(self):
+        controller = AdmissionController(tokens_per_minute=60000, client_rpm={INTERACTIVE: 2, BULK: 2})
+        await controller.acquire("a", INTERACTIVE, cost=1)
+        await controller.acquire("a", INTERACTIVE, cost=1)
+
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire("a", INTERACTIVE, cost=1)
+        self.assertEqual(ctx.exception.status_code, 429)
+        await controller.acquire("b", INTERACTIVE, cost=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from utils.answer_cache import AnswerCache
+
+QUESTION = "Explain the difference between a stack and a queue."
+ANSWER = (
+    "A stack is a linear data structure that follows LIFO order, so the element pushed most "
+    "recently is the first one popped. It supports push, pop and peek in constant time and is "
+    "used for function call stacks, undo features and expression parsing. A queue follows FIFO "
+    "order: elements are enqueued at the rear and dequeued from the front. Queues are used for "
+    "task scheduling, buffering streams and breadth first search over graphs in practice."
+)
+
+
+class AnswerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = AnswerCache()
+        self.cache.put(QUESTION, "Software Engineer", "en", ANSWER, {"score": 9})
+
+    def test_formatting_differences_hit(self):
+        evaluation, similarity = self.cache.get(QUESTION, "software engineer", "en", ANSWER.upper().replace(",", ""))
+        self.assertEqual(evaluation, {"score": 9})
+        self.assertEqual(similarity, 1.0)
+
+    def test_single_word_change_in_long_answer_misses(self):
+        evaluation, similarity = self.cache.get(QUESTION, "Software Engineer", "en", ANSWER.replace("LIFO", "FIFO", 1))
+        self.assertIsNone(evaluation)
+        self.assertGreater(similarity, 0.9)  # Would have passed a ratio-only check
+
+    def test_other_scope_misses(self):
+        evaluation, _ = self.cache.get(QUESTION, "Software Engineer", "hi", ANSWER)
+        self.assertIsNone(evaluation)
+
+    def test_lru_eviction_bounds_entries(self):
+        cache = AnswerCache(max_entries=2)
+        for i in range(3):
+            cache.put(QUESTION, "SE", "en", f"answer number {i} about stacks and queues", {"score": i})
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertIsNone(cache.get(QUESTION, "SE", "en", "answer number 0 about stacks and queues")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
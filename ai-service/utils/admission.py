@@ -0,0 +1,336 @@
+# ─── Admission Control for GPT Calls ──────────────────────────────────────────
+# Per-client token buckets, interactive/bulk priority classes and a bounded
+# weighted-fair queue in front of the upstream tokens-per-minute limit.
+# Requests that cannot be served in time are shed early with a 429.
+
+import asyncio
+import heapq
+import hmac
+import itertools
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# weight: share of upstream capacity under contention
+# reserve: fraction of the upstream bucket this class may not dip into
+# max_wait: longest a request may sit in the queue before it is shed; kept
+#           well below the backend's AI call timeouts (30s/60s) minus GPT latency
+PRIORITY_CLASSES = {
+    INTERACTIVE: {"weight": 4.0, "reserve": 0.0, "max_wait": 10.0},
+    BULK: {"weight": 1.0, "reserve": 0.2, "max_wait": 20.0},
+}
+
+# Caller identity headers are only honored when they can be verified
+TRUSTED_API_KEYS = {k.strip() for k in os.getenv("ADMISSION_API_KEYS", "").split(",") if k.strip()}
+INTERNAL_SECRET = os.getenv("AI_SERVICE_SECRET", "")
+
+PROMPT_OVERHEAD_TOKENS = 200
+CAPACITY_DETAIL = "AI service is at capacity, please retry shortly"
+
+
+def estimate_tokens(text: str, max_tokens: int) -> int:
+    """Rough upstream cost of a completion: prompt (~4 chars/token) + max output."""
+    return len(text) // 4 + PROMPT_OVERHEAD_TOKENS + max_tokens
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens/second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available."""
+        self._refill()
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def try_take(self, amount: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class _Waiter:
+    __slots__ = ("flow", "priority", "cost", "start", "finish", "deadline", "future", "active")
+
+    def __init__(
+        self,
+        flow: Tuple[str, str],
+        priority: str,
+        cost: float,
+        start: float,
+        finish: float,
+        deadline: float,
+        future: asyncio.Future
+    ):
+        self.flow = flow
+        self.priority = priority
+        self.cost = cost
+        self.start = start
+        self.finish = finish
+        self.deadline = deadline
+        self.future = future
+        self.active = True
+
+
+class AdmissionController:
+    """
+    Gatekeeper for upstream GPT calls. Each (priority, client) pair is a
+    flow with its own request-rate bucket; queued requests are released in
+    weighted-fair order (start-time fair queuing) as the shared upstream
+    token bucket allows.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int = 90000,
+        max_queue: int = 200,
+        client_rpm: Optional[Dict[str, int]] = None,
+        max_clients: int = 10000
+    ):
+        self.upstream = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self.max_queue = max_queue
+        self.client_rpm = client_rpm or {INTERACTIVE: 30, BULK: 10}
+        self.max_clients = max_clients
+
+        self._clients: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._queues: Dict[str, List[tuple]] = {p: [] for p in PRIORITY_CLASSES}
+        self._queued = 0
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._counters = {p: {"admitted": 0, "queued": 0, "shed": 0} for p in PRIORITY_CLASSES}
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            tokens_per_minute=int(os.getenv("OPENAI_TPM_LIMIT", "90000")),
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "200")),
+            client_rpm={
+                INTERACTIVE: int(os.getenv("ADMISSION_INTERACTIVE_RPM", "30")),
+                BULK: int(os.getenv("ADMISSION_BULK_RPM", "10")),
+            }
+        )
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+    async def acquire(self, client: str, priority: str = INTERACTIVE, cost: float = 1000):
+        """
+        Wait until the request may call upstream, consuming `cost` tokens
+        from the shared budget. Raises HTTPException(429) if the client is
+        over its rate, the queue is full, or it can no longer be dispatched
+        within the class max_wait.
+        """
+        settings = PRIORITY_CLASSES[priority]
+        cost = min(cost, self.upstream.capacity * (1 - settings["reserve"]))
+        flow = (priority, client)
+
+        bucket = self._client_bucket(flow)
+        if not bucket.try_take(1):
+            raise self._rejection(priority, "Too many requests for this client", bucket.wait_time(1))
+
+        start, finish = self._tags(flow, cost)
+
+        # Fast path: nothing is waiting and the budget covers the request
+        if not self._queued and self._can_dispatch(priority, cost):
+            self._last_finish[flow] = finish
+            self._dispatch(priority, cost, start)
+            return
+
+        if self._queued >= self.max_queue:
+            raise self._rejection(priority, CAPACITY_DETAIL, 1.0)
+
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + settings["max_wait"]
+        waiter = _Waiter(flow, priority, cost, start, finish, deadline, loop.create_future())
+        self._last_finish[flow] = finish
+        heapq.heappush(self._queues[priority], (start, next(self._seq), waiter))
+        self._queued += 1
+        self._counters[priority]["queued"] += 1
+
+        try:
+            self._pump()  # Sheds this request right away if it cannot make its deadline
+            await asyncio.wait_for(waiter.future, settings["max_wait"])
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            raise self._rejection(priority, CAPACITY_DETAIL, 1.0)
+        except BaseException:
+            # Cancellation, a shed 429 or anything else: never strand the waiter
+            self._abandon(waiter)
+            raise
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queued,
+            "upstream_tokens_available": int(self.upstream.available()),
+            "classes": {p: dict(c) for p, c in self._counters.items()},
+        }
+
+    # ─── Internals ────────────────────────────────────────────────────────────
+    def _client_bucket(self, flow: Tuple[str, str]) -> TokenBucket:
+        bucket = self._clients.get(flow)
+        if bucket is None:
+            rpm = self.client_rpm[flow[0]]
+            bucket = TokenBucket(rpm / 60.0, rpm)
+            self._clients[flow] = bucket
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self._prune_flows()
+        else:
+            self._clients.move_to_end(flow)
+        return bucket
+
+    def _prune_flows(self):
+        """Forget finish tags that no longer affect ordering."""
+        self._last_finish = {f: t for f, t in self._last_finish.items() if t > self._virtual_time}
+
+    def _tags(self, flow: Tuple[str, str], cost: float) -> Tuple[float, float]:
+        start = max(self._virtual_time, self._last_finish.get(flow, 0.0))
+        return start, start + cost / PRIORITY_CLASSES[flow[0]]["weight"]
+
+    def _can_dispatch(self, priority: str, cost: float) -> bool:
+        reserve = PRIORITY_CLASSES[priority]["reserve"] * self.upstream.capacity
+        return self.upstream.available() >= cost + reserve
+
+    def _dispatch(self, priority: str, cost: float, start: float):
+        self.upstream.take(cost)
+        self._virtual_time = max(self._virtual_time, start)
+        self._counters[priority]["admitted"] += 1
+
+    def _dequeue(self, waiter: _Waiter):
+        if waiter.active:
+            waiter.active = False
+            self._queued -= 1
+
+    def _abandon(self, waiter: _Waiter):
+        """Remove a waiter that will never be dispatched, undoing its finish tag."""
+        if not waiter.active:
+            return
+        self._dequeue(waiter)
+        if self._last_finish.get(waiter.flow) == waiter.finish:
+            if waiter.start > self._virtual_time:
+                self._last_finish[waiter.flow] = waiter.start
+            else:
+                del self._last_finish[waiter.flow]
+
+    def _rejection(self, priority: str, detail: str, retry_after: float) -> HTTPException:
+        self._counters[priority]["shed"] += 1
+        return HTTPException(
+            status_code=429,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def _shed_hopeless(self):
+        """
+        Walk the queue in fair (start tag) order and reject every waiter whose
+        projected dispatch time, given the tokens queued ahead of it and the
+        upstream refill rate, falls past its deadline.
+        """
+        waiters = sorted(
+            (entry for queue in self._queues.values() for entry in queue if entry[2].active),
+            key=lambda entry: entry[:2]
+        )
+        now = time.monotonic()
+        available = self.upstream.available()
+        ahead = 0.0
+        for _, _, waiter in waiters:
+            if waiter.future.done():
+                self._abandon(waiter)  # Cancelled, but its caller has not run yet
+                continue
+            reserve = PRIORITY_CLASSES[waiter.priority]["reserve"] * self.upstream.capacity
+            eta = max(0.0, (ahead + waiter.cost + reserve - available) / self.upstream.rate)
+            if now + eta > waiter.deadline:
+                self._abandon(waiter)
+                waiter.future.set_exception(self._rejection(waiter.priority, CAPACITY_DETAIL, eta))
+            else:
+                ahead += waiter.cost
+
+    def _head(self, priority: str) -> Optional[tuple]:
+        """Earliest waiter of a class that can still be dispatched."""
+        queue = self._queues[priority]
+        while queue and (not queue[0][2].active or queue[0][2].future.done()):
+            self._abandon(heapq.heappop(queue)[2])
+        return queue[0] if queue else None
+
+    def _pump(self):
+        """Release queued requests in fair order while the budget allows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._shed_hopeless()
+        while True:
+            heads = [h for h in (self._head(p) for p in PRIORITY_CLASSES) if h is not None]
+            if not heads:
+                return
+            heads.sort(key=lambda h: h[:2])
+            ready = next((h for h in heads if self._can_dispatch(h[2].priority, h[2].cost)), None)
+            if ready is None:
+                wait = min(
+                    self.upstream.wait_time(h[2].cost + PRIORITY_CLASSES[h[2].priority]["reserve"] * self.upstream.capacity)
+                    for h in heads
+                )
+                self._timer = asyncio.get_running_loop().call_later(max(wait, 0.01), self._pump)
+                return
+
+            waiter = heapq.heappop(self._queues[ready[2].priority])[2]
+            self._dequeue(waiter)
+            self._dispatch(waiter.priority, waiter.cost, waiter.start)
+            waiter.future.set_result(None)
+
+
+gpt_admission = AdmissionController.from_env()
+
+
+def _is_internal(request: Request) -> bool:
+    """True if the request carries the backend's shared secret."""
+    secret = request.headers.get("x-internal-secret", "")
+    return bool(INTERNAL_SECRET) and hmac.compare_digest(secret, INTERNAL_SECRET)
+
+
+def get_client_key(request: Request) -> str:
+    """
+    Identify the caller: a configured API key, then the user id forwarded by
+    the backend, then the client IP. Unverified identity headers are ignored
+    so callers cannot mint fresh buckets by changing them.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in TRUSTED_API_KEYS:
+        return f"key:{api_key}"
+    user_id = request.headers.get("x-user-id")
+    if user_id and _is_internal(request):
+        return f"user:{user_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def get_priority(request: Request, default: str = INTERACTIVE) -> str:
+    """Callers may downgrade a request to bulk via `X-Priority: bulk`."""
+    if request.headers.get("x-priority", "").lower() == BULK:
+        return BULK
+    return default
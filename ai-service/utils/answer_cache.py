@@ -0,0 +1,157 @@
+# ─── Near-Duplicate Answer Cache ──────────────────────────────────────────────
+# Reuses GPT evaluations for answers that are nearly identical to ones already
+# evaluated for the same (question, role, language). Answers are fingerprinted
+# with MinHash over word shingles and looked up through an LSH band index;
+# candidates are confirmed with the exact Jaccard similarity of their shingles.
+#
+# Changing one word mid-answer alters at most 2 * SHINGLE_SIZE shingles, which
+# a ratio alone cannot catch in long answers (one word in ~70 still scores
+# ~0.92). A hit therefore also caps the number of differing shingles.
+
+import os
+import random
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures are comparable across restarts
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Word n-grams of the lowercased, punctuation-stripped text."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def hash_shingles(shingle_set: Set[str]) -> FrozenSet[int]:
+    """32-bit hashes of the shingles; a compact stand-in for the strings."""
+    return frozenset(zlib.crc32(s.encode("utf-8")) for s in shingle_set)
+
+
+def minhash_signature(hashes: FrozenSet[int]) -> Tuple[int, ...]:
+    return tuple(
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Exact Jaccard similarity of two hashed shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class AnswerCache:
+    """
+    Bounded LRU cache of evaluations with an LSH index per scope.
+    MinHash/LSH only finds candidates; a lookup returns the candidate with
+    the highest exact Jaccard similarity if that meets `threshold` and the
+    two answers differ in at most `max_diff_shingles` shingles.
+    """
+
+    def __init__(self, threshold: float = 0.97, max_diff_shingles: int = 5, max_entries: int = 5000):
+        self.threshold = threshold
+        self.max_diff_shingles = max_diff_shingles
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()
+        self._buckets: Dict[tuple, Set[int]] = {}
+        self._next_id = 0
+        self._hits = 0
+        self._misses = 0
+        self._similarity_total = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AnswerCache":
+        return cls(
+            threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.97")),
+            max_diff_shingles=int(os.getenv("ANSWER_CACHE_MAX_DIFF_SHINGLES", "5")),
+            max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+        )
+
+    @staticmethod
+    def scope(question: str, role: str, language: str) -> tuple:
+        return (" ".join(question.lower().split()), role.lower().strip(), language)
+
+    def _band_keys(self, scope: tuple, signature: Tuple[int, ...]) -> List[tuple]:
+        return [(scope, b, signature[b * ROWS:(b + 1) * ROWS]) for b in range(BANDS)]
+
+    def get(self, question: str, role: str, language: str, answer: str) -> Tuple[Optional[dict], float]:
+        """Return (evaluation, exact similarity) of the best match; evaluation is None below threshold."""
+        scope = self.scope(question, role, language)
+        hashes = hash_shingles(shingles(answer))
+        signature = minhash_signature(hashes)
+
+        candidates: Set[int] = set()
+        for key in self._band_keys(scope, signature):
+            candidates |= self._buckets.get(key, set())
+
+        best_id, best_sim = None, 0.0
+        for entry_id in candidates:
+            sim = jaccard(hashes, self._entries[entry_id]["shingles"])
+            if sim > best_sim:
+                best_id, best_sim = entry_id, sim
+
+        if (
+            best_id is None
+            or best_sim < self.threshold
+            or len(hashes ^ self._entries[best_id]["shingles"]) > self.max_diff_shingles
+        ):
+            self._misses += 1
+            return None, best_sim
+
+        self._entries.move_to_end(best_id)
+        self._hits += 1
+        self._similarity_total += best_sim
+        return dict(self._entries[best_id]["evaluation"]), best_sim
+
+    def put(self, question: str, role: str, language: str, answer: str, evaluation: dict):
+        scope = self.scope(question, role, language)
+        hashes = hash_shingles(shingles(answer))
+        signature = minhash_signature(hashes)
+        entry_id = self._next_id
+        self._next_id += 1
+
+        band_keys = self._band_keys(scope, signature)
+        self._entries[entry_id] = {"shingles": hashes, "band_keys": band_keys, "evaluation": dict(evaluation)}
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        entry_id, entry = self._entries.popitem(last=False)
+        for key in entry["band_keys"]:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "mean_hit_similarity": round(self._similarity_total / self._hits, 4) if self._hits else 0.0,
+            "threshold": self.threshold,
+            "max_diff_shingles": self.max_diff_shingles,
+        }
+
+
+answer_cache = AnswerCache.from_env()
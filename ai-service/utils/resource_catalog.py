@@ -0,0 +1,77 @@
+# ─── Learning Resource Catalog ────────────────────────────────────────────────
+# Free learning resources loaded from data/resources.json, indexed by
+# canonical skill id and language so lookups don't scan the catalog.
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from utils.skill_keywords import canonical_skill_id
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "resources.json")
+DEFAULT_SKILL = "default"
+
+
+class ResourceCatalog:
+    """In-memory index of learning resources: skill id -> language -> resources."""
+
+    def __init__(self, entries: List[dict]):
+        self._index: Dict[str, Dict[str, List[dict]]] = {}
+        for entry in entries:
+            skill_id = canonical_skill_id(entry["skill"])
+            resource = {
+                "title": entry["title"],
+                "url": entry["url"],
+                "type": entry.get("type", "course"),
+                "language": entry.get("language", "en"),
+                "difficulty": entry.get("difficulty", "beginner"),
+            }
+            by_lang = self._index.setdefault(skill_id, {})
+            by_lang.setdefault(resource["language"], []).append(resource)
+
+    @classmethod
+    def from_file(cls, path: str = CATALOG_PATH) -> "ResourceCatalog":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def get(
+        self,
+        skill: str,
+        preferred_language: str = "en",
+        limit: int = 3,
+        resource_type: Optional[str] = None,
+        difficulty: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Resources for a skill, preferred language first, then English, then
+        the rest. Falls back to the generic resources for unknown skills.
+        """
+        by_lang = self._index.get(canonical_skill_id(skill)) or self._index.get(DEFAULT_SKILL, {})
+
+        languages = [preferred_language]
+        if preferred_language != "en":
+            languages.append("en")
+        languages += [lang for lang in by_lang if lang not in languages]
+
+        results = []
+        for lang in languages:
+            for resource in by_lang.get(lang, []):
+                if resource_type and resource["type"] != resource_type:
+                    continue
+                if difficulty and resource["difficulty"] != difficulty:
+                    continue
+                results.append(dict(resource))
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def get_batch(self, skills: List[str], preferred_language: str = "en", limit: int = 3) -> Dict[str, List[dict]]:
+        """Resources for every skill of a roadmap, keyed by the skill as given."""
+        return {skill: self.get(skill, preferred_language, limit) for skill in skills}
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> ResourceCatalog:
+    """Load the catalog once per process."""
+    return ResourceCatalog.from_file()
@@ -0,0 +1,150 @@
+# ─── Roadmap Scheduling Engine ────────────────────────────────────────────────
+# Local (non-GPT) planner: orders skills by prerequisites and packs them into
+# weeks according to the learner's weekly availability.
+
+from typing import Dict, List
+
+from utils.skill_keywords import canonical_skill_id
+
+DEFAULT_EFFORT_HOURS = 20
+
+# Estimated hours for a beginner to become productive in each skill
+SKILL_EFFORT_HOURS = {
+    "python": 30, "javascript": 30, "typescript": 15, "java": 40, "c++": 40,
+    "c": 30, "go": 25, "rust": 40, "kotlin": 25, "php": 20, "bash": 8,
+    "html": 10, "css": 12, "tailwind": 6, "bootstrap": 6,
+    "sql": 20, "mysql": 10, "postgresql": 12, "mongodb": 12, "redis": 8,
+    "git": 8, "linux": 15, "docker": 15, "kubernetes": 25, "aws": 30,
+    "ci/cd": 10, "rest api": 10, "graphql": 12,
+    "react": 25, "vue": 20, "angular": 30, "nextjs": 15, "redux": 10,
+    "nodejs": 20, "express": 12, "django": 25, "flask": 12, "fastapi": 12,
+    "numpy": 10, "pandas": 15, "matplotlib": 6, "excel": 10,
+    "tableau": 12, "power bi": 12, "statistics": 25, "linear algebra": 20,
+    "data analysis": 25, "machine learning": 40, "deep learning": 40,
+    "scikit-learn": 15, "tensorflow": 25, "pytorch": 25, "nlp": 30,
+    "computer vision": 30, "dsa": 40, "object oriented": 12,
+    "system design": 30, "unit testing": 10,
+}
+
+# Skill -> skills that should be learned first
+SKILL_PREREQUISITES = {
+    "typescript": ["javascript"], "css": ["html"], "tailwind": ["css"],
+    "bootstrap": ["css"], "javascript": ["html"],
+    "react": ["javascript", "css"], "vue": ["javascript", "css"],
+    "angular": ["typescript", "css"], "nextjs": ["react"], "redux": ["react"],
+    "nodejs": ["javascript"], "express": ["nodejs"], "rest api": ["nodejs"],
+    "graphql": ["rest api"],
+    "django": ["python", "sql"], "flask": ["python"], "fastapi": ["python"],
+    "mysql": ["sql"], "postgresql": ["sql"],
+    "docker": ["linux"], "kubernetes": ["docker"], "ci/cd": ["git", "docker"],
+    "numpy": ["python"], "pandas": ["numpy"], "matplotlib": ["pandas"],
+    "data analysis": ["pandas", "sql", "statistics"],
+    "scikit-learn": ["pandas"],
+    "machine learning": ["pandas", "statistics", "linear algebra"],
+    "deep learning": ["machine learning"],
+    "tensorflow": ["deep learning"], "pytorch": ["deep learning"],
+    "nlp": ["deep learning"], "computer vision": ["deep learning"],
+    "dsa": ["object oriented"], "system design": ["dsa"],
+}
+
+SKILL_TOPICS = [
+    "Introduction to {skill}",
+    "Core concepts of {skill}",
+    "Hands-on practice with {skill}",
+    "Build a mini project using {skill}",
+]
+
+
+def estimate_effort_hours(skill: str) -> int:
+    """Return the estimated hours needed to learn a skill."""
+    return SKILL_EFFORT_HOURS.get(canonical_skill_id(skill), DEFAULT_EFFORT_HOURS)
+
+
+def is_known_skill(skill: str) -> bool:
+    """True if the planner has an effort estimate for the skill."""
+    return canonical_skill_id(skill) in SKILL_EFFORT_HOURS
+
+
+def order_skills(skills: List[str]) -> List[str]:
+    """
+    Order skills so that prerequisites come first.
+    Prerequisites the learner did not ask for are walked through (so
+    transitive ordering holds) but left out of the result. Otherwise the
+    input order is preserved; duplicate skills are dropped.
+    """
+    requested: Dict[str, str] = {}
+    for skill in skills:
+        requested.setdefault(canonical_skill_id(skill), skill)
+
+    ordered = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(skill_id: str):
+        if state.get(skill_id):
+            return  # Already placed, or a cycle back-edge we ignore
+        state[skill_id] = 1
+        for prereq in SKILL_PREREQUISITES.get(skill_id, []):
+            visit(prereq)
+        state[skill_id] = 2
+        if skill_id in requested:
+            ordered.append(requested[skill_id])
+
+    for skill_id in requested:
+        visit(skill_id)
+    return ordered
+
+
+def _topics_for_part(topics: List[str], skill: str, part: int, parts: int) -> List[str]:
+    """
+    Topics covered by one part of a split skill. With at most as many parts
+    as topics they are spread evenly; otherwise each topic gets one part, the
+    final topic closes the skill, and the parts in between continue practice.
+    """
+    n = len(topics)
+    if parts <= n:
+        return topics[part * n // parts:(part + 1) * n // parts]
+    if part < n - 1:
+        return [topics[part]]
+    if part == parts - 1:
+        return [topics[-1]]
+    return [f"Continue: {topics[n - 2]}", f"Practice {skill} exercises"]
+
+
+def schedule_skills(skills: List[str], availability_hours: int) -> List[dict]:
+    """
+    Pack skills into weeks of `availability_hours` each, in prerequisite
+    order. A skill that does not fit in the remaining hours of a week is
+    split and continues into the following week(s).
+    """
+    capacity = max(1, availability_hours)
+    weekly_plan = []
+    week, used = 1, 0
+
+    for skill in order_skills(skills):
+        remaining = estimate_effort_hours(skill)
+        chunks = []
+        while remaining > 0:
+            if used >= capacity:
+                week, used = week + 1, 0
+            hours = min(remaining, capacity - used)
+            chunks.append((week, hours))
+            used += hours
+            remaining -= hours
+
+        topics = [t.format(skill=skill) for t in SKILL_TOPICS]
+        parts = len(chunks)
+        for i, (chunk_week, hours) in enumerate(chunks):
+            milestone = (
+                f"Complete 2 practice exercises in {skill}"
+                if i == parts - 1
+                else f"Finish part {i + 1} of {parts} of {skill}"
+            )
+            weekly_plan.append({
+                "week": chunk_week,
+                "focus_skill": skill,
+                "topics": _topics_for_part(topics, skill, i, parts),
+                "milestone": milestone,
+                "estimated_hours": hours,
+            })
+
+    return weekly_plan
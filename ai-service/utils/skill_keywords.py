@@ -75,3 +75,29 @@ def get_all_skills_flat() -> list:
     for skills in SKILL_CATEGORIES.values():
         all_skills.extend(skills)
     return list(set(all_skills))
+
+# ─── Canonical Skill Ids ──────────────────────────────────────────────────────
+# Spelling variants that should resolve to the same skill
+SKILL_ALIASES = {
+    "py": "python", "python3": "python",
+    "js": "javascript", "ecmascript": "javascript", "ts": "typescript",
+    "react.js": "react", "reactjs": "react",
+    "vue.js": "vue", "vuejs": "vue",
+    "next.js": "nextjs", "node.js": "nodejs", "node": "nodejs",
+    "express.js": "express", "expressjs": "express",
+    "postgres": "postgresql", "mongo": "mongodb",
+    "k8s": "kubernetes", "gcp": "google cloud",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "ml": "machine learning", "dl": "deep learning",
+    "data structures": "dsa", "algorithms": "dsa",
+    "data structures and algorithms": "dsa",
+    "oop": "object oriented", "oops": "object oriented",
+    "restful": "rest api", "rest": "rest api",
+    "html5": "html", "css3": "css", "tailwindcss": "tailwind",
+    "github": "git",
+}
+
+def canonical_skill_id(skill_name: str) -> str:
+    """Normalize a skill name to its canonical id (lowercase, alias-resolved)."""
+    key = " ".join(skill_name.lower().split())
+    return SKILL_ALIASES.get(key, key)
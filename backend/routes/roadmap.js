@@ -24,7 +24,7 @@ router.post('/generate', authenticateToken, async (req, res) => {
             const aiRes = await axios.post(`${process.env.AI_SERVICE_URL}/roadmap/generate`, {
                 target_role: role.title, missing_skills: missing,
                 availability_hours, preferred_language
-            }, { timeout: 60000 })
+            }, { timeout: 60000, headers: { 'X-User-Id': String(req.user.id), 'X-Internal-Secret': process.env.AI_SERVICE_SECRET || '' } })
             weekly_plan = aiRes.data.weekly_plan || []
         } catch (aiErr) {
             console.warn('AI service unavailable, using fallback roadmap')
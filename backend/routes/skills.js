@@ -60,7 +60,7 @@ router.post('/extract-resume', authenticateToken, upload.single('resume'), async
                 Buffer.from(`\r\n--${boundary}--\r\n`)
             ])
             const aiRes = await axios.post(`${process.env.AI_SERVICE_URL}/skills/extract-resume`, body, {
-                headers: { 'Content-Type': `multipart/form-data; boundary=${boundary}` },
+                headers: { 'Content-Type': `multipart/form-data; boundary=${boundary}`, 'X-User-Id': String(req.user.id), 'X-Internal-Secret': process.env.AI_SERVICE_SECRET || '' },
                 timeout: 30000
             })
             extractedSkills = aiRes.data.skills || []